@@ -1,14 +1,72 @@
 import subprocess
 import shutil
 import sys
+import os
+import time
 import pandas as pd
-import tempfile
-import re
+import requests
+from requests.adapters import HTTPAdapter
+import threading
+import functools
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 
 # --- PREREQUISITE AND VALIDATION FUNCTIONS ---
 
+# Columns the script understands, and the dtypes they're loaded with; anything else in the input CSV
+# is not loaded. Columns whose values repeat across rows are categorical, so each distinct value is
+# stored once.
+CSV_DTYPES = {
+    'repository': 'category',
+    'title': 'string',
+    'parent_title': 'string',
+    'body': 'string',
+    'labels': 'category',
+    'assignees': 'category',
+    'project_name': 'category',
+    'project_number': 'category',
+    'github_issue_url': 'string',
+}
+
+# First line of a state file, recording the fingerprint of the input CSV that passed validation.
+VALIDATED_SENTINEL = "# validated: "
+
+# State file column holding the node ID of an issue that was created but not yet added to its
+# project, so a resumed run can finish the project add instead of skipping the issue.
+PENDING_PROJECT_ADD = 'pending_project_add'
+
+# A successful 'gh auth status' is remembered on disk for an hour, keyed by the 'gh' version.
+AUTH_CACHE_PATH = Path.home() / ".cache" / "issues_csv_to_github" / "gh_ok"
+AUTH_CACHE_TTL_SECONDS = 60 * 60
+
+
+@functools.lru_cache(maxsize=None)
+def check_gh_auth(token):
+    """Runs 'gh auth status' unless a recent success is cached. Raises CalledProcessError if not authenticated."""
+    version = subprocess.run(["gh", "--version"], check=True, capture_output=True, text=True).stdout.strip()
+    try:
+        if time.time() - AUTH_CACHE_PATH.stat().st_mtime < AUTH_CACHE_TTL_SECONDS and AUTH_CACHE_PATH.read_text() == version:
+            return
+    except OSError:
+        pass
+
+    # Passing the token via GH_TOKEN spares 'gh' from resolving it again (config file or OS keychain).
+    subprocess.run(["gh", "auth", "status"], check=True, capture_output=True, env={**os.environ, "GH_TOKEN": token})
+    try:
+        AUTH_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        AUTH_CACHE_PATH.write_text(version)
+    except OSError:
+        pass  # Caching is best-effort.
+
+
+def invalidate_auth_cache():
+    """Forgets a cached 'gh auth status' success, e.g. after GitHub rejects the token."""
+    check_gh_auth.cache_clear()
+    AUTH_CACHE_PATH.unlink(missing_ok=True)
+
+
 def check_gh_prerequisites():
     """Checks for gh installation and authentication."""
     print("1. Checking for GitHub CLI ('gh')...")
@@ -20,7 +78,11 @@ def check_gh_prerequisites():
 
     print("\n2. Checking GitHub authentication status...")
     try:
-        subprocess.run(["gh", "auth", "status"], check=True, capture_output=True)
+        # Read the token once; the auth check and all API calls reuse it, the latter over a
+        # single keep-alive HTTP session.
+        token = subprocess.run(["gh", "auth", "token"], check=True, capture_output=True, text=True).stdout.strip()
+        check_gh_auth(token)
+        _session.headers.update({"Authorization": f"Bearer {token}", "Accept": "application/vnd.github+json"})
         print("   Successfully authenticated with GitHub.")
     except subprocess.CalledProcessError:
         print("\nERROR: You are not authenticated with the GitHub CLI.")
@@ -63,6 +125,25 @@ def check_gh_scopes():
     #     sys.exit(1)
 
 
+def fingerprint_input(input_path):
+    """Returns a cheap fingerprint of the input CSV built from its size, mtime and first 4KB."""
+    stat = input_path.stat()
+    with open(input_path, 'rb') as f:
+        head = f.read(4096)
+    return hashlib.blake2b(f"{stat.st_size}:{stat.st_mtime_ns}:".encode() + head, digest_size=16).hexdigest()
+
+
+def read_state(state_path):
+    """Reads the titles, URLs and pending project adds from a state file. Returns (state_df, fingerprint of the validated input, or None)."""
+    with open(state_path, newline='') as f:
+        first_line = f.readline()
+    # State files written before project adds were tracked have no PENDING_PROJECT_ADD column.
+    read_kwargs = {'usecols': lambda column: column in ('title', 'github_issue_url', PENDING_PROJECT_ADD), 'dtype': 'string'}
+    if first_line.startswith(VALIDATED_SENTINEL):
+        return pd.read_csv(state_path, skiprows=1, **read_kwargs), first_line[len(VALIDATED_SENTINEL):].strip()
+    return pd.read_csv(state_path, **read_kwargs), None
+
+
 def get_and_validate_paths():
     """Gets input path from user and intelligently finds the state file."""
     while True:
@@ -85,6 +166,15 @@ def get_and_validate_paths():
     return input_path, state_path, output_path
 
 
+def is_blank(column):
+    """Returns a boolean mask of the cells in a column that are empty or whitespace-only."""
+    return column.isna() | column.astype(str).str.strip().eq('')
+
+
+# Validation stops collecting row errors after this many, so a badly malformed file can't exhaust memory.
+MAX_ERRORS = 100
+
+
 def validate_dataframe(df):
     """Performs a pre-validation pass on the entire DataFrame."""
     print("\n5. Performing pre-upload validation of the CSV file...")
@@ -95,124 +185,591 @@ def validate_dataframe(df):
         if col not in df.columns: errors.append(f"Missing required column: '{col}'")
     if errors: return errors
 
-    titles = set(df['title'].tolist())
-    for index, row in df.iterrows():
-        if pd.isna(row['repository']) or not row['repository'].strip():
-            errors.append(f"Row {index + 2}: 'repository' field cannot be empty.")
-        if pd.isna(row['title']) or not row['title'].strip():
-            errors.append(f"Row {index + 2}: 'title' field cannot be empty.")
-        if pd.notna(row['parent_title']) and row['parent_title'].strip() and row['parent_title'] not in titles:
-            errors.append(
-                f"Row {index + 2}: 'parent_title' ('{row['parent_title']}') does not match any 'title' in the file.")
+    # Each check is a single vectorized pass over a column rather than a Python loop over rows.
+    missing_repository = is_blank(df['repository'])
+    malformed_repository = ~missing_repository & ~df['repository'].astype(str).str.fullmatch(r"[^/\s]+/[^/\s]+")
+    missing_title = is_blank(df['title'])
+    unknown_parent = ~is_blank(df['parent_title']) & ~df['parent_title'].isin(df['title'])
+
+    # The first MAX_ERRORS errors in row order are always among the first MAX_ERRORS of each check,
+    # so only those are turned into messages.
+    row_errors = [(index, f"Row {index + 2}: 'repository' field cannot be empty.")
+                  for index in df.index[missing_repository][:MAX_ERRORS]]
+    row_errors += [(index, f"Row {index + 2}: 'repository' ('{repo}') must be in 'owner/name' format.")
+                   for index, repo in df.loc[malformed_repository, 'repository'][:MAX_ERRORS].items()]
+    row_errors += [(index, f"Row {index + 2}: 'title' field cannot be empty.")
+                   for index in df.index[missing_title][:MAX_ERRORS]]
+    row_errors += [(index, f"Row {index + 2}: 'parent_title' ('{parent_title}') does not match any 'title' in the file.")
+                   for index, parent_title in df.loc[unknown_parent, 'parent_title'][:MAX_ERRORS].items()]
+    # Report errors in row order, as a row-by-row scan would.
+    row_errors.sort(key=lambda row_error: row_error[0])
+    errors.extend(message for _, message in row_errors[:MAX_ERRORS])
+
+    total_errors = int(missing_repository.sum() + malformed_repository.sum() + missing_title.sum() + unknown_parent.sum())
+    if total_errors > MAX_ERRORS:
+        errors.append(f"... ({total_errors - MAX_ERRORS} more errors truncated)")
 
     if not errors:
         print("   Validation successful.")
     return errors
 
 
-def create_missing_label(repo, error_message):
-    """Parses a missing label from an error and creates it."""
-    match = re.search(r"could not add label: '(.*?)' not found", error_message)
-    if not match: return False, "Could not parse label name from error."
+def create_missing_label(repo, label_name):
+    """Creates a missing label and returns its node ID."""
+    print(f"      -> WARNING: Label '{label_name}' not found. Attempting to create it...")
+    # A stable digest (unlike hash(), which is salted per process) keeps colors the same across runs.
+    color = hashlib.blake2b(label_name.encode(), digest_size=3).hexdigest()
+    try:
+        response = github_request("POST", f"/repos/{repo}/labels", json={"name": label_name, "color": color})
+    except requests.RequestException as e:
+        return None, f"Failed to create missing label '{label_name}'. Reason: {e}"
+    if response.status_code != 201:
+        return None, f"Failed to create missing label '{label_name}'. Reason: {response.text.strip()}"
+    print(f"      -> SUCCESS: Label '{label_name}' created.")
+    return response.json()['node_id'], None
+
+
+def preflight_labels(df):
+    """Looks up each target repository once and creates every missing label up front, in parallel."""
+    print("\n8. Checking labels in the target repositories...")
+    referenced = df[['repository', 'labels']].dropna() if 'labels' in df.columns else df.iloc[0:0]
+    if referenced.empty:
+        print("   No labels referenced.")
+        return
+
+    referenced = referenced.assign(labels=referenced['labels'].astype(str).str.split(',')).explode('labels')
+    referenced['labels'] = referenced['labels'].str.strip()
+    referenced = referenced[referenced['labels'] != ''].drop_duplicates()
+
+    # GitHub label names are case-insensitive, so keep the first spelling of each one.
+    unique_labels = {}
+    for repo, label_name in zip(referenced['repository'], referenced['labels']):
+        unique_labels.setdefault((repo, label_name.lower()), (repo, label_name))
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        repos = referenced['repository'].unique()
+        repositories = dict(zip(repos, pool.map(get_repository, repos)))
+        missing = [(repo, label_name) for (repo, key), (_, label_name) in unique_labels.items()
+                   if not repositories[repo]['error'] and key not in repositories[repo]['labels']]
+        # Failures are left to the per-issue fallback in build_issue_input, which reports them on the row.
+        for (repo, label_name), (label_id, _) in zip(missing, pool.map(lambda item: create_missing_label(*item), missing)):
+            if label_id:
+                repositories[repo]['labels'][label_name.lower()] = label_id
+
+    print(f"   {len(unique_labels)} label(s) referenced, {len(missing)} missing label(s) processed.")
+
+
+# --- GITHUB API HELPERS ---
+
+GITHUB_API_URL = "https://api.github.com"
+
+REPOSITORY_QUERY = """
+query($owner: String!, $name: String!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    id
+    labels(first: 100, after: $cursor) {
+      nodes { id name }
+      pageInfo { hasNextPage endCursor }
+    }
+  }
+}
+"""
+
+USER_QUERY = """
+query($login: String!) {
+  user(login: $login) { id }
+}
+"""
+
+# '@me' (as accepted by 'gh issue create --assignee') is the authenticated user, not a login.
+VIEWER_QUERY = """
+query {
+  viewer { id }
+}
+"""
+
+# Projects can belong to either an organization or a user; whichever lookup fails is ignored.
+PROJECT_QUERY = """
+query($owner: String!, $number: Int!) {
+  organization(login: $owner) { projectV2(number: $number) { id } }
+  user(login: $owner) { projectV2(number: $number) { id } }
+}
+"""
+
+# Maximum number of aliased mutations sent in a single GraphQL document.
+BATCH_SIZE = 25
+
+# Number of batches uploaded concurrently. Each worker has at most one API request in flight, and
+# the upload and preflight pools never run at the same time, so this also caps concurrent requests
+# to stay within GitHub's secondary rate limits.
+MAX_WORKERS = 8
+
+# How many times a rate-limited request is retried before giving up.
+MAX_RETRIES = 5
+
+# Shared across threads so every request reuses the same pooled TCP+TLS connections, one per worker.
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(pool_maxsize=MAX_WORKERS))
+
+# Guards the lookup caches (and label creation) and 'github_issue_url' writes across worker threads.
+_resolve_lock = threading.Lock()
+_issue_map_lock = threading.Lock()
+
+# Set when the run is interrupted, to cut short any rate-limit backoff a worker is waiting out.
+_stop_requested = threading.Event()
+
+_repository_cache = {}
+_user_cache = {}
+_project_cache = {}
+
+
+def github_request(method, path, **kwargs):
+    """Sends a request to the GitHub API on the shared session, backing off while rate limited."""
+    for attempt in range(MAX_RETRIES):
+        response = _session.request(method, f"{GITHUB_API_URL}{path}", timeout=60, **kwargs)
+
+        if response.status_code == 401:
+            invalidate_auth_cache()
+        # Rate-limited requests are rejected before they run, so retrying them never duplicates an issue.
+        if response.status_code not in (403, 429) or attempt == MAX_RETRIES - 1:
+            return response
+        if 'Retry-After' in response.headers:
+            delay = int(response.headers['Retry-After'])
+        elif response.headers.get('X-RateLimit-Remaining') == '0':
+            delay = max(int(response.headers['X-RateLimit-Reset']) - int(time.time()), 1)
+        elif 'secondary rate limit' in response.text.lower():
+            # GitHub asks clients to wait at least a minute before retrying, then back off exponentially.
+            delay = 60 * 2 ** attempt
+        elif response.status_code == 429:
+            delay = 2 ** attempt
+        else:
+            return response
+        print(f"      -> WARNING: Rate limited by GitHub. Retrying in {delay}s...")
+        if _stop_requested.wait(delay):
+            return response
+    return response
 
-    missing_label = match.group(1)
-    print(f"      -> WARNING: Label '{missing_label}' not found. Attempting to create it...")
+
+def run_graphql(query, variables=None):
+    """Sends a GraphQL document to the GitHub API and returns (data, errors)."""
     try:
-        color = "%06x" % (hash(missing_label) & 0xFFFFFF)
-        label_cmd = ["gh", "label", "create", missing_label, "--repo", repo, "--color", color]
-        subprocess.run(label_cmd, check=True, capture_output=True, text=True)
-        print(f"      -> SUCCESS: Label '{missing_label}' created.")
-        return True, None
-    except subprocess.CalledProcessError as e:
-        return False, f"Failed to create missing label '{missing_label}'. Reason: {e.stderr.strip()}"
+        response = github_request("POST", "/graphql", json={"query": query, "variables": variables or {}})
+        payload = response.json()
+    except (requests.RequestException, ValueError) as e:
+        return {}, [{"message": f"Request to GitHub failed. Reason: {e}"}]
+
+    # A partially failed document still returns data for the parts that succeeded.
+    errors = payload.get('errors') or []
+    if not response.ok and not errors:
+        errors = [{"message": payload.get('message', f"HTTP {response.status_code}")}]
+    return payload.get('data') or {}, errors
+
+
+def first_error(errors, *fields):
+    """Returns the message of the first GraphQL error raised under one of the given top-level fields."""
+    for error in errors:
+        if (error.get('path') or [None])[0] in fields:
+            return error.get('message')
+    return None
+
+
+def document_error(data, errors):
+    """Returns the message of an error that failed a whole GraphQL request (network, 5xx, query-level), or None."""
+    for error in errors:
+        if not error.get('path'):
+            return error.get('message', 'Unknown GraphQL error.')
+    return None if data else "No data returned."
+
+
+def read_repository(repo, data, errors, field='repository'):
+    """Builds a repository cache entry from a lookup response, fetching any remaining pages of labels."""
+    owner, name = repo.split('/', 1)
+    # A 'transient' entry comes from a request that failed as a whole, and must not be cached.
+    repository = {'id': None, 'labels': {}, 'error': None, 'transient': False}
+    while True:
+        reason = document_error(data, errors)
+        if reason:
+            repository.update(id=None, error=f"Could not look up repository '{repo}'. Reason: {reason}", transient=True)
+            break
+        node = data.get(field)
+        if not node:
+            repository['error'] = first_error(errors, field) or f"Repository '{repo}' not found."
+            break
+        repository['id'] = node['id']
+        for label in node['labels']['nodes']:
+            repository['labels'][label['name'].lower()] = label['id']
+        if not node['labels']['pageInfo']['hasNextPage']:
+            break
+        cursor = node['labels']['pageInfo']['endCursor']
+        data, errors = run_graphql(REPOSITORY_QUERY, {"owner": owner, "name": name, "cursor": cursor})
+        field = 'repository'
+    return repository
+
+
+def read_project(data, errors, fields=('organization', 'user')):
+    """Extracts (project_id, error_message) from a project lookup response."""
+    for field in fields:
+        project = (data.get(field) or {}).get('projectV2')
+        if project:
+            return project['id'], None
+    return None, first_error(errors, *fields) or "Project not found."
+
+
+def read_user(login, data, errors, field='user'):
+    """Extracts (user_id, error_message) from a user lookup response."""
+    user = data.get(field)
+    if user:
+        return user['id'], None
+    reason = first_error(errors, field)
+    return None, f"Could not resolve assignee '{login}'." + (f" Reason: {reason}" if reason else "")
+
+
+def get_repository(repo):
+    """Looks up a repository's node ID and its labels (lower-cased name -> node ID), with caching."""
+    if repo in _repository_cache:
+        return _repository_cache[repo]
+    owner, name = repo.split('/', 1)
+    data, errors = run_graphql(REPOSITORY_QUERY, {"owner": owner, "name": name, "cursor": None})
+    repository = read_repository(repo, data, errors)
+    if not repository['transient']:
+        _repository_cache[repo] = repository
+    return repository
+
+
+def get_user_id(login):
+    """Looks up a user's node ID by login ('@me' for the authenticated user), with caching. Returns (user_id, error_message)."""
+    if login not in _user_cache:
+        field = 'viewer' if login == '@me' else 'user'
+        data, errors = run_graphql(VIEWER_QUERY) if login == '@me' else run_graphql(USER_QUERY, {"login": login})
+        reason = document_error(data, errors)
+        if reason:
+            return None, f"Could not resolve assignee '{login}'. Reason: {reason}"
+        _user_cache[login] = read_user(login, data, errors, field)
+    return _user_cache[login]
+
+
+def get_project_id(owner, project_number):
+    """Looks up a Project (V2) node ID by owner and number, with caching. Returns (project_id, error_message)."""
+    if not project_number:
+        return None, "'project_number' is empty."
+    key = (owner, project_number)
+    if key not in _project_cache:
+        if not project_number.isdigit():
+            _project_cache[key] = (None, f"Invalid project number '{project_number}'.")
+            return _project_cache[key]
+        data, errors = run_graphql(PROJECT_QUERY, {"owner": owner, "number": int(project_number)})
+        reason = document_error(data, errors)
+        if reason:
+            return None, f"Could not look up the project. Reason: {reason}"
+        _project_cache[key] = read_project(data, errors)
+    return _project_cache[key]
+
+
+def preflight_targets(df):
+    """Resolves every repository, project and assignee in the CSV to node IDs with a single aliased query."""
+    print("\n7. Looking up target repositories, projects and assignees...")
+    targets = df[['repository', 'project_number']].drop_duplicates().astype(str)
+    repos = list(dict.fromkeys(targets['repository']))
+    projects = list(dict.fromkeys((repo.split('/')[0], number) for repo, number in targets.itertuples(index=False)
+                                  if number.isdigit()))
+    logins = []
+    if 'assignees' in df.columns:
+        logins = list(dict.fromkeys(login for cell in df['assignees'].dropna().unique() for login in split_list(cell)))
+    if not repos:
+        return
+
+    variables, fields, arguments = {}, [], []
+    for n, repo in enumerate(repos):
+        variables[f"r{n}_owner"], variables[f"r{n}_name"] = repo.split('/', 1)
+        arguments.append(f"$r{n}_owner: String!, $r{n}_name: String!")
+        fields.append(f"""  r{n}: repository(owner: $r{n}_owner, name: $r{n}_name) {{
+    id
+    labels(first: 100) {{ nodes {{ id name }} pageInfo {{ hasNextPage endCursor }} }}
+  }}""")
+    for n, (owner, number) in enumerate(projects):
+        variables[f"p{n}_owner"], variables[f"p{n}_number"] = owner, int(number)
+        arguments.append(f"$p{n}_owner: String!, $p{n}_number: Int!")
+        fields.append(f"  p{n}_org: organization(login: $p{n}_owner) {{ projectV2(number: $p{n}_number) {{ id }} }}")
+        fields.append(f"  p{n}_user: user(login: $p{n}_owner) {{ projectV2(number: $p{n}_number) {{ id }} }}")
+    for n, login in enumerate(logins):
+        if login == '@me':
+            fields.append(f"  u{n}: viewer {{ id }}")
+            continue
+        variables[f"u{n}_login"] = login
+        arguments.append(f"$u{n}_login: String!")
+        fields.append(f"  u{n}: user(login: $u{n}_login) {{ id }}")
+
+    query = f"query({', '.join(arguments)}) {{\n" + "\n".join(fields) + "\n}"
+    data, errors = run_graphql(query, variables)
+    # A failure that isn't tied to one alias (network, 5xx, query complexity) says nothing about
+    # the individual targets, so nothing is cached and each issue looks up its own target instead.
+    reason = document_error(data, errors)
+    if reason:
+        print(f"   -> WARNING: Batched lookup failed. Reason: {reason}")
+        print("      Targets will be looked up per issue instead.")
+        return
+    for n, repo in enumerate(repos):
+        repository = read_repository(repo, data, errors, field=f"r{n}")
+        if not repository['transient']:
+            _repository_cache[repo] = repository
+        if repository['error']:
+            print(f"   -> WARNING: {repository['error']}")
+    for n, key in enumerate(projects):
+        _project_cache[key] = read_project(data, errors, fields=(f"p{n}_org", f"p{n}_user"))
+        if not _project_cache[key][0]:
+            print(f"   -> WARNING: Project '{key[0]}' Number '{key[1]}': {_project_cache[key][1]}")
+    for n, login in enumerate(logins):
+        _user_cache[login] = read_user(login, data, errors, field=f"u{n}")
+        if not _user_cache[login][0]:
+            print(f"   -> WARNING: {_user_cache[login][1]}")
+    print(f"   Resolved {len(repos)} repo(s), {len(projects)} project(s) and {len(logins)} assignee(s).")
+
+
+def resolve_target(repo, project_number):
+    """Looks up a repository and its owner's project, usually from the caches filled by preflight_targets."""
+    return get_repository(repo), get_project_id(repo.split('/')[0], project_number)
+
+
+def cell_text(value):
+    """Returns a CSV cell as a string, or '' for an empty cell (which pandas reads as NaN)."""
+    return '' if pd.isna(value) else str(value)
+
+
+def split_list(value):
+    """Splits a comma-separated CSV cell into a list of stripped, non-empty values."""
+    if pd.isna(value): return []
+    return [item.strip() for item in str(value).split(',') if item.strip()]
 
 
 # --- CORE LOGIC ---
 
-def process_issue(issue_data, issue_map):
-    """Recursive function to process an issue and its children first."""
-    # Base case: if issue is already processed, return its URL
+def is_created(issue_data):
+    """Checks whether an issue already has a GitHub URL, e.g. from a resumed run."""
     # Convert to string to prevent errors if pandas reads an empty cell as NaN (float).
     # This handles valid URLs, empty strings, and NaN values safely.
-    if str(issue_data.get('github_issue_url', '')).startswith('https'):
-        return issue_data['github_issue_url']
+    return str(issue_data.get('github_issue_url', '')).startswith('https')
 
-    # Recursive step: process all children first
-    children_titles = issue_data.get('children', [])
-    child_issue_map = {title: issue_map[title] for title in children_titles}
 
-    for title, child_data in child_issue_map.items():
-        process_issue(child_data, issue_map)
+def set_issue_url(issue_data, value, pending_issue_id=None):
+    """Records the created issue URL (or error) for an issue, and the node ID of an issue still to be added
+    to its project; safe to call from worker threads."""
+    with _issue_map_lock:
+        issue_data['github_issue_url'] = value
+        issue_data[PENDING_PROJECT_ADD] = pending_issue_id
 
-    # Now, process the current issue
-    print(f"\nProcessing: '{issue_data['title']}'")
-
-    repo = issue_data.get('repository')
-    body_with_links = issue_data.get('body')
 
-    # If it's a parent, construct the final body with child links
+def save_progress(issue_map, output_path, fingerprint):
+    """Atomically snapshots the issue map to the output CSV and returns the columns written."""
+    with _issue_map_lock:
+        snapshot = pd.DataFrame.from_dict(issue_map, orient='index')
+    # A sibling file opened with open() gets the usual umask-based permissions, unlike a tempfile (0600).
+    temp_path = output_path.with_name(f"{output_path.name}.tmp")
+    try:
+        with open(temp_path, 'w', newline='') as f:
+            f.write(f"{VALIDATED_SENTINEL}{fingerprint}\n")
+            snapshot.to_csv(f, index=False)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    return list(snapshot.columns)
+
+
+def append_progress(issues, columns, output_path):
+    """Appends just-processed issues to the output CSV. On resume, the last row for a title wins."""
+    with _issue_map_lock:
+        rows = pd.DataFrame(issues, columns=columns)
+    with open(output_path, 'a', newline='') as f:
+        rows.to_csv(f, header=False, index=False)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def build_issue_body(issue_data, issue_map):
+    """Returns the issue body, with a checklist linking to its children for parent issues."""
+    body = issue_data.get('body')
+    body_with_links = body if pd.notna(body) else ''
+
+    children_titles = issue_data['children']
     if children_titles:
         links = []
         for title in children_titles:
-            child_url = issue_map[title].get('github_issue_url', '')
-            if child_url.startswith('https'):
-                issue_number = f"#{child_url.split('/')[-1]}"
+            if is_created(issue_map[title]):
+                issue_number = f"#{issue_map[title]['github_issue_url'].split('/')[-1]}"
                 links.append(f"- [ ] {issue_number} {title}")
             else:
                 links.append(f"- [ ] (Failed) {title}")
 
         body_with_links += "\n\n### Child Issues\n" + "\n".join(links)
 
-    # --- Create the issue (with retries for missing labels) ---
-    issue_url = None
-    for attempt in range(5):
-        cmd = ["gh", "issue", "create", "--repo", repo]
-        cmd.extend(["--title", issue_data.get('title')])
-
-        with tempfile.NamedTemporaryFile(mode='w+', delete=False, suffix=".md") as tf:
-            tf.write(body_with_links)
-            body_filepath = tf.name
-        cmd.extend(["--body-file", body_filepath])
-
-        if pd.notna(issue_data.get('labels')): cmd.extend(["--label", issue_data.get('labels')])
-        if pd.notna(issue_data.get('assignees')): cmd.extend(["--assignee", issue_data.get('assignees')])
-
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
-            issue_url = result.stdout.strip()
-            issue_data['github_issue_url'] = issue_url
-            print(f"   -> SUCCESS (Step 1/2): Created issue -> {issue_url}")
-            break
-        except subprocess.CalledProcessError as e:
-            error_message = e.stderr.strip()
-            if "could not add label" in error_message and "not found" in error_message:
-                success, remediation_error = create_missing_label(repo, error_message)
-                if not success:
-                    issue_data['github_issue_url'] = f"ERR: {remediation_error}"
-                    break
-            else:
-                issue_data['github_issue_url'] = f"ERR: {error_message}"
-                break
-        finally:
-            Path(body_filepath).unlink()
+    return body_with_links
+
+
+def build_issue_input(issue_data, issue_map):
+    """Builds the 'CreateIssueInput' for an issue. Returns (input, error_message)."""
+    repo = issue_data.get('repository')
+
+    # Lookups are serialized so concurrent batches never create the same missing label twice,
+    # nor look up the same repository or project twice. The project ID is resolved here, together
+    # with the repository, so adding the issue to its project afterwards needs no extra lookup.
+    with _resolve_lock:
+        repository, _ = resolve_target(repo, cell_text(issue_data.get('project_number')))
+        if repository['error']:
+            return None, repository['error']
+
+        label_ids = []
+        for label_name in split_list(issue_data.get('labels')):
+            label_id = repository['labels'].get(label_name.lower())
+            if not label_id:
+                label_id, remediation_error = create_missing_label(repo, label_name)
+                if not label_id:
+                    return None, remediation_error
+                repository['labels'][label_name.lower()] = label_id
+            label_ids.append(label_id)
+
+        assignee_ids = []
+        for login in split_list(issue_data.get('assignees')):
+            user_id, error_message = get_user_id(login)
+            if not user_id:
+                return None, error_message
+            assignee_ids.append(user_id)
+
+    issue_input = {
+        "repositoryId": repository['id'],
+        "title": issue_data.get('title'),
+        "body": build_issue_body(issue_data, issue_map),
+        "labelIds": label_ids,
+        "assigneeIds": assignee_ids,
+    }
+    return issue_input, None
+
+
+@functools.lru_cache(maxsize=None)
+def build_batched_mutation(mutation, input_type, selection, count):
+    """Builds (once per shape) a document with 'count' aliased mutations a0..aN taking variables $i0..$iN."""
+    variables = ", ".join(f"$i{n}: {input_type}!" for n in range(count))
+    fields = "\n".join(f"  a{n}: {mutation}(input: $i{n}) {selection}" for n in range(count))
+    return f"mutation({variables}) {{\n{fields}\n}}"
+
+
+def run_batched_mutation(mutation, input_type, selection, inputs):
+    """Runs one aliased mutation per input in a single document. Returns (results, error_messages)."""
+    document = build_batched_mutation(mutation, input_type, selection, len(inputs))
+    data, errors = run_graphql(document, {f"i{n}": issue_input for n, issue_input in enumerate(inputs)})
+
+    results = [data.get(f"a{n}") for n in range(len(inputs))]
+    messages = [None] * len(inputs)
+    for error in errors:
+        path = error.get('path') or []
+        # Errors are attributed to their alias; document-level errors apply to every unfinished input.
+        targets = [int(path[0][1:])] if path and str(path[0]).startswith('a') else range(len(inputs))
+        for n in targets:
+            if not results[n] and not messages[n]:
+                messages[n] = error.get('message', 'Unknown GraphQL error.')
+    return results, messages
+
+
+def batch_create_issues(siblings, issue_map):
+    """Creates a batch of sibling issues with a single aliased 'createIssue' mutation. Returns [(issue_data, issue_id)]."""
+    inputs, pending = [], []
+
+    for n, issue_data in enumerate(siblings):
+        print(f"\nProcessing: '{issue_data['title']}'")
+        issue_input, error_message = build_issue_input(issue_data, issue_map)
+        if error_message:
+            set_issue_url(issue_data, f"ERR: {error_message}")
+            print(f"   -> FAILURE (Step 1/2): {error_message}")
+            continue
+        inputs.append(issue_input)
+        pending.append(n)
+
+    if not inputs:
+        return []
+
+    results, messages = run_batched_mutation("createIssue", "CreateIssueInput", "{ issue { id url } }", inputs)
+    created = []
+    for n, result, error_message in zip(pending, results, messages):
+        issue_data = siblings[n]
+        issue = (result or {}).get('issue')
+        if issue:
+            set_issue_url(issue_data, issue['url'], pending_issue_id=issue['id'])
+            created.append((issue_data, issue['id']))
+            print(f"   -> SUCCESS (Step 1/2): Created issue '{issue_data['title']}' -> {issue['url']}")
+        else:
+            set_issue_url(issue_data, f"ERR: {error_message}")
+            print(f"   -> FAILURE (Step 1/2): '{issue_data['title']}': {error_message}")
+
+    return created
+
+
+def add_to_projects(created):
+    """Adds a batch of created issues to their projects with a single aliased 'addProjectV2ItemById' mutation."""
+    inputs, pending = [], []
+    for issue_data, issue_id in created:
+        owner = issue_data.get('repository').split('/')[0]
+        project_num = cell_text(issue_data.get('project_number'))
+        print(f"   -> Attempting (Step 2/2): Add '{issue_data['title']}' to Project '{owner}' Number '{project_num}'")
+        with _resolve_lock:
+            project_id, reason = get_project_id(owner, project_num)
+        if not project_id:
+            error_message = f"ERR: Issue created but FAILED to add to project. Reason: {reason}"
+            set_issue_url(issue_data, error_message)
+            print(f"   -> FAILURE (Step 2/2): {error_message}")
+            continue
+        inputs.append({"projectId": project_id, "contentId": issue_id})
+        pending.append(issue_data)
+
+    if not inputs:
+        return
+
+    results, messages = run_batched_mutation("addProjectV2ItemById", "AddProjectV2ItemByIdInput", "{ item { id } }", inputs)
+    for issue_data, result, reason in zip(pending, results, messages):
+        if result and result.get('item'):
+            set_issue_url(issue_data, issue_data['github_issue_url'])
+            print(f"   -> SUCCESS (Step 2/2): Added '{issue_data['title']}' to project.")
+        else:
+            error_message = f"ERR: Issue created but FAILED to add to project. Reason: {reason}"
+            set_issue_url(issue_data, error_message)
+            print(f"   -> FAILURE (Step 2/2): {error_message}")
 
-    if not issue_url:
-        return None
 
-    # --- Add to project ---
+def add_created_to_projects(pool, created, columns, output_path):
+    """Adds created issues to their projects in parallel batches, appending each batch's rows to the output CSV."""
+    print(f"\n--- Adding {len(created)} issue(s) to projects ---")
+    batches = [created[start:start + BATCH_SIZE] for start in range(0, len(created), BATCH_SIZE)]
+    futures = [pool.submit(add_to_projects, batch) for batch in batches]
     try:
-        owner = repo.split('/')[0]
-        project_num = str(issue_data.get('project_number'))
-        print(f"   -> Attempting (Step 2/2): Add to Org Project '{owner}' Number '{project_num}'")
-        project_cmd = ["gh", "project", "item-add", project_num, "--owner", owner, "--url", issue_url]
-        subprocess.run(project_cmd, check=True, capture_output=True, text=True)
-        print(f"   -> SUCCESS (Step 2/2): Added to project.")
-    except subprocess.CalledProcessError as e:
-        error_message = f"ERR: Issue created but FAILED to add to project. Reason: {e.stderr.strip()}"
-        issue_data['github_issue_url'] = error_message
-        print(f"   -> FAILURE (Step 2/2): {error_message}")
+        for batch, future in zip(batches, futures):
+            future.result()
+            append_progress([issue_data for issue_data, _ in batch], columns, output_path)
+    except BaseException:
+        # Batches not yet started stay pending in the output CSV, for a resumed run to finish.
+        for future in futures:
+            future.cancel()
+        raise
+
+
+def group_by_height(roots, issue_map):
+    """Groups pending issues into levels by height (0 for leaves), so every issue's children are in an earlier level."""
+    heights = {}
+    # Iterative post-order walk: an issue is pushed back on the stack beneath its children and its
+    # height is computed when it is popped again, after all of them. Already-created issues (and
+    # their subtrees) are skipped, as on a resumed run.
+    stack = [(root_data, False) for root_data in reversed(roots) if not is_created(root_data)]
+    while stack:
+        issue_data, children_visited = stack.pop()
+        pending_children = [issue_map[child_title] for child_title in issue_data['children']
+                            if not is_created(issue_map[child_title])]
+        if children_visited:
+            heights[issue_data['title']] = 1 + max((heights[child['title']] for child in pending_children), default=-1)
+        else:
+            stack.append((issue_data, True))
+            stack.extend((child, False) for child in reversed(pending_children))
 
-    return issue_url
+    levels = [[] for _ in range(max(heights.values(), default=-1) + 1)]
+    for title, height in heights.items():
+        levels[height].append(issue_map[title])
+    return levels
 
 
 def main():
@@ -222,45 +779,101 @@ def main():
     input_path, state_path, output_path = get_and_validate_paths()
 
     try:
-        df = pd.read_csv(input_path, converters={'project_number': str})
+        df = pd.read_csv(input_path, usecols=lambda column: column in CSV_DTYPES, dtype=CSV_DTYPES)
     except Exception as e:
         print(f"\nERROR: Could not read CSV file. Reason: {e}")
         sys.exit(1)
 
-    validation_errors = validate_dataframe(df)
-    if validation_errors:
-        print("\nValidation failed. Please fix these issues and try again:")
-        for error in validation_errors: print(f"- {error}")
-        sys.exit(1)
+    # A state file records the fingerprint of the input it was validated against, so an
+    # unchanged input doesn't need to be validated again on resume.
+    fingerprint = fingerprint_input(input_path)
+    state_df, state_fingerprint = read_state(state_path) if state_path else (None, None)
+    if state_fingerprint == fingerprint:
+        print("\n5. Skipping validation: the input file is unchanged since it last passed.")
+    else:
+        validation_errors = validate_dataframe(df)
+        if validation_errors:
+            print("\nValidation failed. Please fix these issues and try again:")
+            for error in validation_errors: print(f"- {error}")
+            sys.exit(1)
 
     # --- Phase 1: Build the Tree & Merge State ---
-    issue_map = {row['title']: row.to_dict() for index, row in df.iterrows()}
+    if 'github_issue_url' not in df.columns:
+        df['github_issue_url'] = None
+    df[PENDING_PROJECT_ADD] = None
+    issue_map = {record['title']: dict(record, children=[]) for record in df.to_dict(orient='records')}
     roots = []
 
     if state_path:
         print(f"\n6. Merging state from '{state_path}'...")
-        state_df = pd.read_csv(state_path)
-        for index, row in state_df.iterrows():
-            if row['title'] in issue_map:
-                issue_map[row['title']]['github_issue_url'] = row['github_issue_url']
+        # Later rows win, since progress is appended to the state file as issues are processed.
+        url_map = dict(zip(state_df['title'], state_df['github_issue_url']))
+        pending_map = dict(zip(state_df['title'], state_df[PENDING_PROJECT_ADD])) if PENDING_PROJECT_ADD in state_df else {}
+        for title, data in issue_map.items():
+            if title in url_map:
+                data['github_issue_url'] = url_map[title]
+                data[PENDING_PROJECT_ADD] = pending_map.get(title)
         print("   State merged successfully.")
 
     for title, data in issue_map.items():
         parent_title = data.get('parent_title')
         if pd.notna(parent_title) and parent_title in issue_map:
-            if 'children' not in issue_map[parent_title]:
-                issue_map[parent_title]['children'] = []
             issue_map[parent_title]['children'].append(title)
         else:
             roots.append(data)
 
-    print("\n7. Starting hierarchical issue creation process...")
+    preflight_targets(df)
+    preflight_labels(df)
+
+    print("\n9. Starting hierarchical issue creation process...")
 
     # --- Phase 2: Process the Tree ---
-    for root_data in roots:
-        process_issue(root_data, issue_map)
-        # Save progress after each top-level root is processed
-        pd.DataFrame.from_dict(issue_map, orient='index').to_csv(output_path, index=False)
+    # Issues are created bottom-up, one level of siblings at a time, and only then added to their
+    # projects, so no project-add round-trip sits between one level and the next.
+    levels = group_by_height(roots, issue_map)
+    columns = save_progress(issue_map, output_path, fingerprint)
+    # Issues a previous run created but was stopped before adding to their projects.
+    created = [(data, data[PENDING_PROJECT_ADD]) for data in issue_map.values()
+               if is_created(data) and pd.notna(data[PENDING_PROJECT_ADD])]
+    futures = {}
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            try:
+                for level_num, level in enumerate(levels, start=1):
+                    print(f"\n--- Level {level_num}/{len(levels)}: {len(level)} issue(s) ---")
+                    # Sibling batches are independent, so upload them concurrently. Every batch of a
+                    # level must finish before the next level, since parents link to their children.
+                    futures = {pool.submit(batch_create_issues, batch, issue_map): batch
+                               for batch in (level[start:start + BATCH_SIZE] for start in range(0, len(level), BATCH_SIZE))}
+                    for future in as_completed(futures):
+                        batch = futures.pop(future)
+                        created.extend(future.result())
+                        # Save progress after each batch by appending only its rows
+                        append_progress(batch, columns, output_path)
+            except BaseException as e:
+                interrupted = not isinstance(e, Exception)
+                if interrupted:
+                    _stop_requested.set()
+                # Stop the queued batches, but wait for the running ones and keep what they created.
+                for future in futures:
+                    future.cancel()
+                for future, batch in futures.items():
+                    if future.cancelled():
+                        continue
+                    if future.exception() is None:
+                        created.extend(future.result())
+                    append_progress(batch, columns, output_path)
+                # After an error, still add whatever was created to its project. An interrupt (Ctrl-C)
+                # leaves those adds marked pending in the output CSV for a resumed run instead.
+                if interrupted:
+                    print(f"\nInterrupted. {len(created)} created issue(s) will be added to their projects on resume.")
+                else:
+                    add_created_to_projects(pool, created, columns, output_path)
+                raise
+            add_created_to_projects(pool, created, columns, output_path)
+    finally:
+        # Consolidate the appended rows into one row per issue
+        save_progress(issue_map, output_path, fingerprint)
 
     print(f"\nProcess complete. Final results saved to '{output_path}'.")
 